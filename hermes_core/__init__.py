@@ -6,6 +6,8 @@ except ImportError:
     __version__ = "unknown version"
     version_tuple = (0, 0, "unknown version")
 
+from types import MappingProxyType
+
 from hermes_core.util.config import load_config, print_config
 from hermes_core.util.logger import _init_log
 
@@ -18,17 +20,28 @@ log = _init_log(config=config)
 __all__ = ["config", "print_config"]
 
 MISSION_NAME = "hermes"
-INST_NAMES = ["eea", "nemisis", "merit", "spani"]
-INST_SHORTNAMES = ["eea", "nms", "mrt", "spn"]
-INST_FULLNAMES = [
+INST_NAMES = ("eea", "nemisis", "merit", "spani")
+INST_SHORTNAMES = ("eea", "nms", "mrt", "spn")
+INST_FULLNAMES = (
     "Electron Electrostatic Analyzer",
     "Noise Eliminating Magnetometer Instrument in a Small Integrated System",
     "Miniaturized Electron pRoton Telescope",
     "Solar Probe Analyzer for Ions",
-]
-INST_TARGETNAMES = ["EEA", "MAG", "MERIT", "SPANI"]
-INST_TO_SHORTNAME = dict(zip(INST_NAMES, INST_SHORTNAMES))
-INST_TO_TARGETNAME = dict(zip(INST_NAMES, INST_TARGETNAMES))
-INST_TO_FULLNAME = dict(zip(INST_NAMES, INST_FULLNAMES))
+)
+INST_TARGETNAMES = ("EEA", "MAG", "MERIT", "SPANI")
+INST_TO_SHORTNAME = MappingProxyType(
+    {"eea": "eea", "nemisis": "nms", "merit": "mrt", "spani": "spn"}
+)
+INST_TO_TARGETNAME = MappingProxyType(
+    {"eea": "EEA", "nemisis": "MAG", "merit": "MERIT", "spani": "SPANI"}
+)
+INST_TO_FULLNAME = MappingProxyType(
+    {
+        "eea": "Electron Electrostatic Analyzer",
+        "nemisis": "Noise Eliminating Magnetometer Instrument in a Small Integrated System",
+        "merit": "Miniaturized Electron pRoton Telescope",
+        "spani": "Solar Probe Analyzer for Ions",
+    }
+)
 
 # log.info(f"hermes_core version: {__version__}")
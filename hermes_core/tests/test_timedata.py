@@ -2,11 +2,13 @@
 
 from collections import OrderedDict
 from pathlib import Path
+import copy
 import datetime
 import pytest
 import numpy as np
 from numpy.random import random
 import tempfile
+import warnings
 from astropy.timeseries import TimeSeries
 from astropy.table import Column
 from astropy.time import Time
@@ -109,6 +111,32 @@ def test_multidimensional_data():
         _ = TimeData(ts)
 
 
+def test_timedata_no_copy():
+    ts = get_test_timeseries()
+    input_attrs = TimeData.global_attribute_template("eea", "l1", "1.0.0")
+
+    # By default the TimeSeries is copied
+    test_data = TimeData(ts, meta=input_attrs)
+    assert test_data.data is not ts
+    assert test_data["measurement"].meta["CATDESC"] == "Test Metadata"
+
+    # Ownership of the TimeSeries can be handed over without a copy
+    ts = get_test_timeseries()
+    test_data = TimeData(ts, meta=input_attrs, _unsafe_no_copy=True)
+    assert test_data.data is ts
+    assert test_data["measurement"].meta["CATDESC"] == "Test Metadata"
+    assert test_data["measurement"].meta["VAR_TYPE"] == "metadata"
+
+
+def test_timedata_slots():
+    td = get_test_timedata()
+    assert not hasattr(td, "__dict__")
+
+    td_copy = copy.copy(td)
+    assert td_copy.data is td.data
+    assert td_copy.columns == td.columns
+
+
 def test_timedata_valid_attrs():
     # fmt: off
     input_attrs = {
@@ -195,9 +223,67 @@ def test_default_properties():
 
     # __contains__
     assert "time" in test_data
+    assert "test" not in test_data
     with pytest.raises(KeyError):
         _ = test_data["test"]
 
+    # __getitem__ of a column added directly to the TimeSeries
+    test_data.data["test"] = Quantity(np.arange(10), "m")
+    assert test_data["test"] is test_data.data["test"]
+    assert "test" in test_data
+    assert test_data.columns == ["time", "measurement", "test"]
+    assert len(test_data) == 3
+    assert test_data.shape == (10, 3)
+
+
+def test_timedata_as_arrays():
+    td = get_test_timedata()
+
+    arrays = td.as_arrays()
+    assert list(arrays.keys()) == ["Bx"]
+    assert isinstance(arrays["Bx"], np.ndarray)
+    assert not isinstance(arrays["Bx"], Quantity)
+    assert td.as_arrays() is not arrays
+    assert td.as_arrays()["Bx"] is arrays["Bx"]
+
+    # Arrays are views onto the measurement data
+    arrays["Bx"][0] = 10
+    assert td["Bx"][0] == 10 * u.gauss
+
+    # Modifying the returned mapping does not change the cached views
+    del arrays["Bx"]
+    assert list(td.as_arrays().keys()) == ["Bx"]
+
+    # Adding a measurement invalidates the cache
+    td["By"] = Quantity([1, 2, 3, 4], "gauss")
+    assert list(td.as_arrays().keys()) == ["Bx", "By"]
+
+    td.remove_measurement("By")
+    assert list(td.as_arrays().keys()) == ["Bx"]
+
+    # Replacing a column through the TimeSeries invalidates the cache
+    td.data["Bx"] = Quantity([5, 6, 7, 8], "gauss")
+    assert np.all(td.as_arrays()["Bx"] == [5, 6, 7, 8])
+
+
+def test_timedata_units():
+    td = get_test_timedata()
+    assert td.units["Bx"] == u.gauss
+    assert td.units["time"] == td["time"].meta["UNITS"]
+
+    # Units are updated when measurements are added
+    td["By"] = Quantity([1, 2, 3, 4], "nT")
+    assert list(td.units.keys()) == ["time", "Bx", "By"]
+    assert td.units["By"] == u.nT
+
+    # Units follow columns replaced directly in the TimeSeries
+    td.data["By"] = Quantity([1, 2, 3, 4], "gauss")
+    assert td.units["By"] == u.gauss
+
+    # Modifying the returned mapping does not change the units
+    del td.units["Bx"]
+    assert td.units["Bx"] == u.gauss
+
 
 def test_timedata_single_measurement():
     # fmt: off
@@ -261,6 +347,37 @@ def test_timedata_add_measurement():
     assert len(test_data) == data_len
 
 
+def test_timedata_add_measurements():
+    td = get_test_timedata()
+
+    # Add non-Quantity
+    with pytest.raises(TypeError):
+        td.add_measurements({"By": Quantity([1, 2, 3, 4], "gauss"), "Bz": [1, 2, 3, 4]})
+    assert td.columns == ["time", "Bx"]
+
+    by = Quantity([1, 2, 3, 4], "gauss")
+    by.meta = OrderedDict({"CATDESC": "Test By"})
+    td.add_measurements({"By": by, "Bz": Quantity([1, 2, 3, 4], "gauss")})
+    assert td.columns == ["time", "Bx", "By", "Bz"]
+    assert td["By"].meta["CATDESC"] == "Test By"
+    assert td["Bz"].meta["UNITS"] == "G"
+
+
+def test_timedata_from_columns():
+    time = Time("2016-03-22T12:30:31") + np.arange(4) * 3 * u.s
+    bx = Quantity([1, 2, 3, 4], "gauss", dtype=np.uint16)
+    bx.meta = OrderedDict({"CATDESC": "Test Bx"})
+    input_attrs = TimeData.global_attribute_template("eea", "l1", "1.0.0")
+
+    td = TimeData.from_columns(
+        time, {"Bx": bx, "By": Quantity([1, 2, 3, 4], "gauss")}, meta=input_attrs
+    )
+    assert td.columns == ["time", "Bx", "By"]
+    assert td["Bx"].meta["CATDESC"] == "Test Bx"
+    assert td.meta["Descriptor"] == input_attrs["Descriptor"]
+    assert len(td.time) == 4
+
+
 def test_timedata_plot():
     # fmt: off
     input_attrs = {
@@ -326,6 +443,13 @@ def test_timedata_append():
     with pytest.raises(ValueError):
         test_data.append(ts)
 
+    # Append non-Quantity Measurement
+    ts = TimeSeries()
+    ts["time"] = Time(np.arange(start=10, stop=20), format="unix")
+    ts["measurement"] = random(size=(10))
+    with pytest.raises(TypeError):
+        test_data.append(ts)
+
     # Append Good
     ts = TimeSeries()
     time = np.arange(start=10, stop=20)
@@ -549,6 +673,74 @@ def test_timedata_from_cdf():
         assert len(result) == len(result2)
 
 
+def test_timedata_load_columns():
+    """Test that only the requested measurements are loaded"""
+    sample_file = str(
+        Path(hermes_core.__file__).parent
+        / "data"
+        / "sample"
+        / "hermes_nms_default_l1_20160322_123031_v0.0.1.cdf"
+    )
+    td = TimeData.load(sample_file, columns=["Bx GSE"])
+    assert td.columns == ["time", "Bx GSE"]
+
+    with pytest.raises(KeyError):
+        _ = TimeData.load(sample_file, columns=["Bx GSE", "not a measurement"])
+
+    # Handler hints must be supported by the file type
+    with pytest.raises(ValueError):
+        _ = TimeData.load(sample_file, chunk_cache_size=1024 * 1024)
+
+
+def test_timedata_load_cache():
+    """Test that repeated loads of a file are cached until the file changes"""
+    td = get_test_timedata()
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        test_file_output_path = td.save(output_path=tmpdirname)
+
+        td1 = TimeData.load(test_file_output_path, cache=True)
+        td2 = TimeData.load(test_file_output_path, cache=True)
+        # Loads share the cached data but not the TimeSeries
+        assert td1.data is not td2.data
+        td1["By"] = Quantity([1, 2, 3, 4], "gauss")
+        td1.meta["TEXT"] = "Changed"
+        td3 = TimeData.load(test_file_output_path, cache=True)
+        assert td3.columns == ["time", "Bx"]
+        assert td3.meta["TEXT"] != "Changed"
+
+        # A changed file is read again
+        td.add_measurement(
+            "Bz", Quantity([1, 2, 3, 4], "gauss"), meta={"CATDESC": "Test"}
+        )
+        td.save(output_path=tmpdirname, overwrite=True)
+        td4 = TimeData.load(test_file_output_path, cache=True)
+        assert td4.columns == ["time", "Bx", "Bz"]
+
+        # The file type is taken from the given path, not the file it links to
+        blob_path = Path(tmpdirname) / "blob"
+        Path(test_file_output_path).rename(blob_path)
+        link_path = Path(tmpdirname) / "link.cdf"
+        link_path.symlink_to(blob_path)
+        td5 = TimeData.load(link_path, cache=True)
+        assert td5.columns == ["time", "Bx", "Bz"]
+
+
+def test_timedata_load_time_range():
+    """Test that only the records within a time range are loaded"""
+    sample_file = str(
+        Path(hermes_core.__file__).parent
+        / "data"
+        / "sample"
+        / "hermes_nms_default_l1_20160322_123031_v0.0.1.cdf"
+    )
+    full_td = TimeData.load(sample_file)
+    time_range = (full_td.time[10], full_td.time[19])
+    td = TimeData.load(sample_file, time_range=time_range)
+    assert td.shape == (10, full_td.shape[1])
+    assert td.time[0] == full_td.time[10]
+    assert (td["Bx GSE"] == full_td["Bx GSE"][10:20]).all()
+
+
 @pytest.mark.parametrize(
     "bitlength",
     [
@@ -670,6 +862,174 @@ def test_overwrite_save():
         assert Path(td.save(output_path=tmpdirname, overwrite=True)).exists()
 
 
+def test_timedata_hdf5_roundtrip():
+    """Test that data saved to HDF5 can be loaded back"""
+    pytest.importorskip("h5py")
+
+    td = get_test_timedata()
+    td["By"] = Quantity([1.5, 2.5, 3.5, 4.5], "nT")
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        test_file_output_path = td.save(output_path=tmpdirname, file_extension=".h5")
+        assert Path(test_file_output_path).exists()
+        assert Path(test_file_output_path).suffix == ".h5"
+        # Small files are not padded to a large size
+        assert Path(test_file_output_path).stat().st_size < 64 * 1024
+
+        # without overwrite set trying to create the file again should lead to an error
+        with pytest.raises(FileExistsError):
+            td.save(output_path=tmpdirname, file_extension=".h5")
+        td.save(output_path=tmpdirname, overwrite=True, file_extension=".h5")
+
+        new_td = TimeData.load(test_file_output_path)
+        single_td = TimeData.load(test_file_output_path, columns=["By"])
+        range_td = TimeData.load(
+            test_file_output_path,
+            # Times are stored with nanosecond precision
+            time_range=(td.time[1] - 1 * u.ms, td.time[2] + 1 * u.ms),
+            chunk_cache_size=1024 * 1024,
+        )
+
+    assert range_td.shape == (2, 3)
+    assert (range_td["By"] == td["By"][1:3]).all()
+
+    assert single_td.columns == ["time", "By"]
+    assert new_td.columns == td.columns
+    assert (abs(new_td.time - td.time) < 1 * u.us).all()
+    for name in ["Bx", "By"]:
+        assert (new_td[name] == td[name]).all()
+        assert new_td[name].dtype == td[name].dtype
+        assert new_td[name].meta["CATDESC"] == td[name].meta["CATDESC"]
+    assert new_td.meta["Logical_file_id"] == td.meta["Logical_file_id"]
+    assert new_td.meta["DOI"] is None
+
+
+def test_timedata_hdf5_attributes():
+    """Test that metadata saved to HDF5 is loaded back with the same types"""
+    pytest.importorskip("h5py")
+
+    td = get_test_timedata()
+    td.meta["TEXT"] = ""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        test_file_output_path = td.save(output_path=tmpdirname, file_extension=".h5")
+        # Loading should not override any of the saved metadata
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            new_td = TimeData.load(test_file_output_path)
+
+    assert new_td.meta["TEXT"] == ""
+    assert new_td.meta["DOI"] is None
+    assert new_td.meta["Generation_date"] == td.meta["Generation_date"]
+    for attr_name in ["FILLVAL", "VALIDMIN", "VALIDMAX"]:
+        assert new_td["time"].meta[attr_name] == td["time"].meta[attr_name]
+
+
+def test_timedata_cdf_to_hdf5():
+    """Test that the global metadata of a CDF file is kept when converted to HDF5"""
+    pytest.importorskip("h5py")
+
+    sample_file = str(
+        Path(hermes_core.__file__).parent
+        / "data"
+        / "sample"
+        / "hermes_nms_default_l1_20160322_123031_v0.0.1.cdf"
+    )
+    td = TimeData.load(sample_file)
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        test_file_output_path = td.save(output_path=tmpdirname, file_extension=".h5")
+        new_td = TimeData.load(test_file_output_path)
+
+    assert new_td.meta.keys() == td.meta.keys()
+    for attr_name, attr_value in td.meta.items():
+        assert new_td.meta[attr_name] == attr_value
+        assert type(new_td.meta[attr_name]) is type(attr_value)
+
+
+def test_hdf5_blosc_direct_chunks():
+    """Test that chunks written directly with Blosc can be read back"""
+    h5py = pytest.importorskip("h5py")
+    pytest.importorskip("blosc")
+    pytest.importorskip("hdf5plugin")
+    from hermes_core.util.io import HDF5Handler
+
+    td = get_test_timedata()
+    td["By"] = Quantity(random(size=(4)), "nT")
+    handler = HDF5Handler()
+    handler.use_blosc = True
+    # Use chunks smaller than the data to check partial edge chunks
+    handler.chunk_length = 3
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        test_file_output_path = handler.save_data(td, tmpdirname)
+        with h5py.File(test_file_output_path, "r") as h5_file:
+            assert h5_file["By"].chunks == (3,)
+            assert "32001" in h5_file["By"]._filters  # Blosc filter id
+
+        ts = handler.load_data(test_file_output_path)
+
+    for name in ["Bx", "By"]:
+        assert (ts[name] == td[name]).all()
+
+
+def test_hdf5_paged_aggregation():
+    """Test that files written with paged aggregation can be read back"""
+    h5py = pytest.importorskip("h5py")
+    from hermes_core.util.io import HDF5Handler
+
+    td = get_test_timedata()
+    handler = HDF5Handler()
+    handler.fs_page_size = 4096
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        test_file_output_path = handler.save_data(td, tmpdirname)
+        with h5py.File(test_file_output_path, "r") as h5_file:
+            fcpl = h5_file.id.get_create_plist()
+            assert fcpl.get_file_space_page_size() == 4096
+        # Files are padded to whole pages
+        assert Path(test_file_output_path).stat().st_size % 4096 == 0
+
+        ts = handler.load_data(test_file_output_path)
+
+    assert (ts["Bx"] == td["Bx"]).all()
+
+
+def test_hdf5_missing_filter(monkeypatch):
+    """Test that loading data compressed with an unavailable filter gives a clear error"""
+    h5py = pytest.importorskip("h5py")
+    pytest.importorskip("blosc")
+    pytest.importorskip("hdf5plugin")
+    from hermes_core.util.io import HDF5Handler
+
+    td = get_test_timedata()
+    handler = HDF5Handler()
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        # Files are written with the built-in filter unless Blosc is requested
+        test_file_output_path = handler.save_data(td, tmpdirname)
+        with h5py.File(test_file_output_path, "r") as h5_file:
+            assert "lzf" in h5_file["Bx"]._filters
+        Path(test_file_output_path).unlink()
+
+        handler.use_blosc = True
+        test_file_output_path = handler.save_data(td, tmpdirname)
+        monkeypatch.setattr(
+            h5py.h5z, "filter_avail", lambda filter_id: filter_id != 32001
+        )
+        with pytest.raises(ImportError, match="hdf5plugin"):
+            handler.load_data(test_file_output_path)
+
+        # Other unavailable filters do not point to hdf5plugin
+        Path(test_file_output_path).unlink()
+        handler.use_blosc = False
+        test_file_output_path = handler.save_data(td, tmpdirname)
+        monkeypatch.setattr(h5py.h5z, "filter_avail", lambda filter_id: False)
+        with pytest.raises(ImportError) as excinfo:
+            handler.load_data(test_file_output_path)
+        assert "hdf5plugin" not in str(excinfo.value)
+
+
+def test_unsupported_handler():
+    """Test that only file types with a handler can be loaded"""
+    with pytest.raises(ValueError):
+        _ = TimeData.load("hermes_eea_l1_20160322T123031_v1.0.0.txt")
+
+
 def test_without_cdf_lib():
     """Function to test TimeData Functions without the use of spacepy.pycdf libraries"""
     # fmt: off
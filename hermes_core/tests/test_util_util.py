@@ -251,3 +251,19 @@ def test_parse_l0_filenames(filename, instrument, time, level, version, mode):
     assert result['time'] == Time(time)
     assert result['mode'] == mode
 # fmt: on
+
+
+# fmt: off
+@pytest.mark.parametrize("filepath,result", [
+    ("hermes_eea_l1_20240406T120621_v1.2.3.cdf", ".cdf"),
+    ("/data/hermes_eea_l1_20240406T120621_v1.2.3.CDF", ".cdf"),
+    ("/data/v1.2.3/hermes_eea_l1.h5", ".h5"),
+    ("/data/v1.2.3/hermes_eea_l1", ""),
+    ("hermes_eea_l1", ""),
+    ("hermes_eea_l1.", ""),
+]
+)
+def test_get_file_extension(filepath, result):
+    """Test that file extensions are found and lower-cased"""
+    assert util._get_file_extension(filepath) == result
+# fmt: on
@@ -2,6 +2,9 @@
 Container class for Measurement Data.
 """
 
+import functools
+import inspect
+import os
 from pathlib import Path
 from collections import OrderedDict
 import numpy as np
@@ -10,13 +13,39 @@ from astropy.timeseries import TimeSeries
 from astropy.table import vstack
 from astropy import units as u
 import hermes_core
-from hermes_core.util.io import CDFHandler
+from hermes_core.util.io import CDFHandler, HDF5Handler
 from hermes_core.util.schema import HERMESDataSchema
 from hermes_core.util.exceptions import warn_user
-from hermes_core.util.util import VALID_DATA_LEVELS
+from hermes_core.util.util import VALID_DATA_LEVELS, _get_file_extension
 
 __all__ = ["TimeData"]
 
+# Mapping of (lower-case) file extension to the handler used for that file type
+_HANDLERS = {".cdf": CDFHandler, ".h5": HDF5Handler}
+
+
+def _get_handler(file_extension):
+    """
+    Returns an instance of the I/O handler registered for the given file extension.
+    """
+    handler_cls = _HANDLERS.get(file_extension.lower())
+    if handler_cls is None:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+    return handler_cls()
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(handler_cls, file_key, columns, time_range, handler_kwargs):
+    """
+    Loads a file with the given I/O handler class and caches the resulting `TimeSeries`.
+
+    ``file_key`` is the (real path, modification time, size) of the file so that cached
+    data is no longer used once the file changes. All arguments must be hashable.
+    """
+    return handler_cls().load_data(
+        file_key[0], columns=columns, time_range=time_range, **dict(handler_kwargs)
+    )
+
 
 class TimeData:
     """
@@ -53,49 +82,71 @@ class TimeData:
     * `Space Physics Guidelines for CDF (ISTP) <https://spdf.gsfc.nasa.gov/istp_guide/istp_guide.html>`_
     """
 
-    def __init__(self, data, meta=None):
+    __slots__ = (
+        "_data",
+        "schema",
+        "_array_cache",
+    )
+
+    def __init__(self, data, meta=None, _unsafe_no_copy=False):
         # Verify TimeSeries compliance
+        self._check_timeseries(data)
+
+        # Copy the TimeSeries, unless ownership of a freshly built one is handed over
+        if _unsafe_no_copy:
+            self._data = data
+        else:
+            self._data = TimeSeries(data, copy=True)
+
+        # Array views of the TimeSeries are created on first use
+        self._array_cache = None
+
+        # Add Input Metadata
+        if meta is not None and isinstance(meta, dict):
+            self._data.meta.update(meta)
+
+        # Add any Metadata from the original TimeSeries
+        # The template is loaded from the schema so only get it once for all measurements
+        template = self.measurement_attribute_template()
+        for col_name, col, orig_col in zip(
+            self._data.colnames, self._data.itercols(), data.itercols()
+        ):
+            # Get the original metadata before it is replaced, `col` may be `orig_col`
+            orig_meta = getattr(orig_col, "meta", None) or {}
+            if col_name == "time":
+                # Only copy the metadata if it would be shared with the original TimeSeries
+                col.meta = orig_meta if col is orig_col else dict(orig_meta)
+            else:
+                # Add Measurement Metadata
+                col.meta = {**template, **orig_meta}
+
+        # Derive Metadata
+        self.schema = HERMESDataSchema()
+        self._derive_metadata()
+
+    @staticmethod
+    def _check_timeseries(data):
+        """
+        Function to verify that a `TimeSeries` is valid measurement data.
+        """
         if not isinstance(data, TimeSeries):
             raise TypeError("Data must be a TimeSeries object.")
         if len(data.columns) < 2:
             raise ValueError("Data must have at least 2 columns")
 
         # Check individual Columns
-        for colname in data.columns:
-            # Verify that all Measurements are `Quantity`
-            if colname != "time" and not isinstance(data[colname], u.Quantity):
+        for colname, col in zip(data.colnames, data.itercols()):
+            # Verify that all Measurements are `Quantity` (the only columns with units)
+            if colname != "time" and getattr(col, "unit", None) is None:
                 raise TypeError(
                     f"Column '{colname}' must be an astropy.Quantity object"
                 )
             # Verify that the Column is only a single dimension
-            if len(data[colname].shape) > 1:  # If there is more than 1 Dimension
+            if len(col.shape) > 1:  # If there is more than 1 Dimension
                 raise ValueError(
                     f"Column '{colname}' must be a one-dimensional measurement. Split additional dimensions into unique measurenents."
                 )
 
-        # Copy the TimeSeries
-        self._data = TimeSeries(data, copy=True)
-
-        # Add Input Metadata
-        if meta is not None and isinstance(meta, dict):
-            self._data.meta.update(meta)
-
-        # Add any Metadata from the original TimeSeries
-        self._data["time"].meta = OrderedDict()
-        if hasattr(data["time"], "meta"):
-            self._data["time"].meta.update(data["time"].meta)
-
-        # Add Measurement Metadata
-        for col in self._data.columns:
-            if col != "time":
-                self._data[col].meta = self.measurement_attribute_template()
-                if hasattr(data[col], "meta"):
-                    self._data[col].meta.update(data[col].meta)
-
-        # Derive Metadata
-        self.schema = HERMESDataSchema()
-        self._derive_metadata()
-
     @property
     def data(self):
         """
@@ -115,19 +166,14 @@ class TimeData:
         """
         (`collections.OrderedDict`) The units of the measurement for each column in the `TimeSeries` table.
         """
-        units = {}
-        for name in self._data.columns:
-            var_data = self._data[name]
-
-            # Get the Unit
-            if hasattr(var_data, "unit"):
-                unit = var_data.unit
-            elif "UNITS" in var_data.meta and var_data.meta["UNITS"]:
-                unit = var_data.meta["UNITS"]
-            else:
-                unit = None
-            units[name] = unit
-        return OrderedDict(units)
+        # Use the Quantity unit if there is one, otherwise fall back to the UNITS metadata
+        return OrderedDict(
+            (
+                name,
+                col.unit if hasattr(col, "unit") else col.meta.get("UNITS") or None,
+            )
+            for name, col in zip(self._data.colnames, self._data.itercols())
+        )
 
     @property
     def columns(self):
@@ -172,30 +218,29 @@ class TimeData:
         """
         Returns a string representation of the `TimeData` class.
         """
-        str_repr = f"TimeData() Object:\n"
+        str_repr = ["TimeData() Object:\n"]
         # Global Attributes/Metedata
-        str_repr += f"Global Attrs:\n"
+        str_repr.append("Global Attrs:\n")
         for attr_name, attr_value in self._data.meta.items():
-            str_repr += f"\t{attr_name}: {attr_value}\n"
+            str_repr.append(f"\t{attr_name}: {attr_value}\n")
         # Measurement Data
-        str_repr += f"Measurement Data:\n{self._data}\n"
-        return str_repr
+        str_repr.append(f"Measurement Data:\n{self._data}\n")
+        return "".join(str_repr)
 
     def __len__(self):
         """
         Function to get the number of measurements.
         """
-        return len(self._data.keys())
+        return len(self._data.columns)
 
     def __getitem__(self, name):
         """
         Function to get a measurement.
         """
-        if name not in self._data.colnames:
+        if name not in self._data.columns:
             raise KeyError(f"Can't find data measurement {name}")
         # Get the Data and Attrs for the named measurement
-        var_data = self._data[name]
-        return var_data
+        return self._data[name]
 
     def __setitem__(self, name, data):
         """
@@ -220,6 +265,37 @@ class TimeData:
 
             yield (name, var_data)
 
+    def as_arrays(self):
+        """
+        Get the measurements as plain `numpy.ndarray` objects, bypassing the `TimeSeries`.
+
+        The arrays are views onto the underlying data, so in-place operations modify the
+        measurements. The units of each array are given by `units`.
+
+        Returns
+        -------
+        arrays : `dict`
+            A mapping of measurement name to the array of values, excluding time.
+        """
+        measurements = [
+            (name, col) for name, col in self._data.columns.items() if name != "time"
+        ]
+        # Rebuild the views if any column was added, removed or replaced since caching
+        cache = self._array_cache
+        if (
+            cache is None
+            or len(cache) != len(measurements)
+            or any(
+                name != cached_name or col is not cached_col
+                for (name, col), (cached_name, cached_col, _) in zip(
+                    measurements, cache
+                )
+            )
+        ):
+            cache = [(name, col, col.value) for name, col in measurements]
+            self._array_cache = cache
+        return {name: values for name, _, values in cache}
+
     @staticmethod
     def global_attribute_template(instr_name="", data_level="", version=""):
         """
@@ -387,17 +463,13 @@ class TimeData:
         Raises
         ------
         TypeError: If var_data is not of type Quantity.
+
+        Notes
+        -----
+        Metadata is re-derived for all measurements on every call. To add many
+        measurements use `add_measurements` which does this only once.
         """
-        # Verify that all Measurements are `Quantity`
-        if (not isinstance(data, u.Quantity)) or (not data.unit):
-            raise TypeError(
-                f"Measurement {measure_name} must be type `astropy.units.Quantity` and have `unit` assigned."
-            )
-        # Verify that the Column is only a single dimension
-        if len(data.shape) > 1:  # If there is more than 1 Dimension
-            raise ValueError(
-                f"Column '{measure_name}' must be a one-dimensional measurement. Split additional dimensions into unique measurenents."
-            )
+        self._check_measurement(measure_name, data)
 
         self._data[measure_name] = data
         # Add any Metadata from the original Quantity
@@ -410,6 +482,51 @@ class TimeData:
         # Derive Metadata Attributes for the Measurement
         self._derive_metadata()
 
+    def add_measurements(self, measurements: dict):
+        """
+        Add several new measurements (columns) at once.
+
+        Parameters
+        ----------
+        measurements: `dict`
+            A mapping of measurement name to `astropy.units.Quantity` data. The data must
+            have the same time stamps as the existing data. Any metadata is taken from
+            the ``meta`` attribute of each `~astropy.units.Quantity`.
+
+        Raises
+        ------
+        TypeError: If any of the data is not of type Quantity.
+        """
+        for measure_name, data in measurements.items():
+            self._check_measurement(measure_name, data)
+
+        # Add all the Columns to the TimeSeries in one step
+        self._data.add_columns(list(measurements.values()), names=list(measurements))
+        # Add any Metadata from the original Quantities
+        for measure_name, data in measurements.items():
+            self._data[measure_name].meta = self.measurement_attribute_template()
+            if hasattr(data, "meta"):
+                self._data[measure_name].meta.update(data.meta)
+
+        # Derive Metadata Attributes for the Measurements
+        self._derive_metadata()
+
+    @staticmethod
+    def _check_measurement(measure_name, data):
+        """
+        Function to verify that data can be added as a measurement.
+        """
+        # Verify that all Measurements are `Quantity`
+        if (not isinstance(data, u.Quantity)) or (not data.unit):
+            raise TypeError(
+                f"Measurement {measure_name} must be type `astropy.units.Quantity` and have `unit` assigned."
+            )
+        # Verify that the Column is only a single dimension
+        if len(data.shape) > 1:  # If there is more than 1 Dimension
+            raise ValueError(
+                f"Column '{measure_name}' must be a one-dimensional measurement. Split additional dimensions into unique measurenents."
+            )
+
     def remove_measurement(self, measure_name: str):
         """
         Remove an existing measurement (column).
@@ -529,10 +646,7 @@ class TimeData:
             The data to be appended (rows) as a `TimeSeries` object.
         """
         # Verify TimeSeries compliance
-        if not isinstance(data, TimeSeries):
-            raise TypeError("Data must be a TimeSeries object.")
-        if len(data.columns) < 2:
-            raise ValueError("Data must have at least 2 columns")
+        self._check_timeseries(data)
         if len(self.data.columns) != len(data.columns):
             raise ValueError(
                 (
@@ -541,13 +655,6 @@ class TimeData:
                 )
             )
 
-        # Check individual Columns
-        for colname in self.data.columns:
-            if colname != "time" and not isinstance(self.data[colname], u.Quantity):
-                raise TypeError(
-                    f"Column '{colname}' must be an astropy.Quantity object"
-                )
-
         # Save Metadata since it is not carried over with vstack
         metadata_holder = {col: self.data[col].meta for col in self.columns}
 
@@ -561,7 +668,7 @@ class TimeData:
         # Re-Derive Metadata
         self._derive_metadata()
 
-    def save(self, output_path=None, overwrite=False):
+    def save(self, output_path=None, overwrite=False, file_extension=".cdf"):
         """
         Save the data to a HERMES CDF file.
 
@@ -572,22 +679,56 @@ class TimeData:
             If not provided, saves to the current directory.
         overwrite : `bool`
             If set, overwrites existing file of the same name.
+        file_extension : `str`, optional
+            The file format to save to. Must be ".cdf" (default) or ".h5".
+            Saving to HDF5 requires the optional `h5py` package.
+
         Returns
         -------
         path : `str`
             A path to the saved file.
         """
-        handler = CDFHandler()
+        handler = _get_handler(file_extension)
         if not output_path:
             output_path = str(Path.cwd())
         if overwrite:
-            cdf_file_path = Path(output_path) / (self.meta["Logical_file_id"] + ".cdf")
-            if cdf_file_path.exists():
-                cdf_file_path.unlink()
+            file_path = Path(output_path) / (
+                self.meta["Logical_file_id"] + file_extension.lower()
+            )
+            if file_path.exists():
+                file_path.unlink()
         return handler.save_data(data=self, file_path=output_path)
 
     @classmethod
-    def load(cls, file_path):
+    def from_columns(cls, time, columns, meta=None):
+        """
+        Create a `TimeData` from a set of measurements in a single step.
+
+        Parameters
+        ----------
+        time : `astropy.time.Time`
+            The times of the measurements.
+        columns : `dict`
+            A mapping of measurement name to `astropy.units.Quantity` data. Any metadata
+            is taken from the ``meta`` attribute of each `~astropy.units.Quantity`.
+        meta : `dict`, optional
+            The metadata describing the time series in an ISTP-compliant format.
+
+        Returns
+        -------
+        data : `TimeData`
+            A `TimeData` object containing the measurements.
+        """
+        ts = TimeSeries(time=time, data=columns)
+        # Metadata on the Quantities is not carried over into the TimeSeries
+        for measure_name, data in columns.items():
+            if hasattr(data, "meta"):
+                ts[measure_name].meta = data.meta
+        # The TimeSeries was just created so there is no need to copy it again
+        return cls(ts, meta=meta, _unsafe_no_copy=True)
+
+    @classmethod
+    def load(cls, file_path, columns=None, time_range=None, cache=False, **kwargs):
         """
         Load data from a file.
 
@@ -595,6 +736,22 @@ class TimeData:
         ----------
         file_path : `str`
             A fully specificed file path.
+        columns : `list[str]`, optional
+            The names of the measurements to load. Time is always loaded.
+            If not provided, all measurements are loaded.
+        time_range : `tuple`, optional
+            The (start, end) times of the records to load, inclusive.
+            If not provided, all records are loaded.
+        cache : `bool`, optional
+            If set, the data read from the file is kept in memory so that loading the same
+            unchanged file again does not re-read it. The data of up to 32 loads is kept
+            for the life of the process and each load returns a copy of it.
+            Files are identified by their path, modification time and size, so a file
+            rewritten with the same size may not be re-read on file systems with coarse
+            modification times.
+        **kwargs : `dict`, optional
+            Additional keyword arguments handed to the file type handler, such as
+            ``chunk_cache_size`` for HDF5 files.
 
         Returns
         -------
@@ -604,17 +761,41 @@ class TimeData:
         Raises
         ------
         ValueError: If the file type is not recognized as a file type that can be loaded.
+        ValueError: If any of the keyword arguments are not supported for the file type.
+        KeyError: If any of the requested measurements are not in the file.
 
         """
         # Determine the file type
-        file_extension = Path(file_path).suffix
+        file_extension = _get_file_extension(file_path)
 
         # Create the appropriate handler object based on file type
-        if file_extension == ".cdf":
-            handler = CDFHandler()
-        else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
+        handler = _get_handler(file_extension)
 
-        # Load data using the handler and return a TimeData object
-        data = handler.load_data(file_path)
+        # Verify that the handler accepts the additional keyword arguments
+        handler_params = inspect.signature(handler.load_data).parameters
+        unsupported = [name for name in kwargs if name not in handler_params]
+        if unsupported:
+            raise ValueError(
+                f"Unsupported keyword arguments for {file_extension} files: {unsupported}"
+            )
+
+        if not cache:
+            # Load data using the handler and return a TimeData object
+            # The handler builds a new TimeSeries so there is no need to copy it again
+            data = handler.load_data(
+                file_path, columns=columns, time_range=time_range, **kwargs
+            )
+            return cls(data, _unsafe_no_copy=True)
+
+        # Identify the file by its state on disk so changed files are read again
+        real_path = os.path.realpath(file_path)
+        file_stat = os.stat(real_path)
+        data = _load_cached(
+            type(handler),
+            (real_path, file_stat.st_mtime_ns, file_stat.st_size),
+            None if columns is None else tuple(columns),
+            None if time_range is None else tuple(time_range),
+            tuple(sorted(kwargs.items())),
+        )
+        # The cached TimeSeries is shared between loads so it must be copied
         return cls(data)
@@ -1,12 +1,20 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import ast
+import datetime
+import json
+import numpy as np
 from astropy.timeseries import TimeSeries
 from astropy.time import Time
+from astropy import units as u
 from hermes_core.util.exceptions import warn_user
 from hermes_core.util.schema import HERMESDataSchema
 
-__all__ = ["CDFHandler"]
+__all__ = ["CDFHandler", "HDF5Handler"]
+
+# Registered HDF5 filter id of the Blosc compressor
+BLOSC_FILTER_ID = 32001
 
 # ================================================================================================
 #                                   ABSTRACT HANDLER
@@ -19,7 +27,7 @@ class TimeDataIOHandler(ABC):
     """
 
     @abstractmethod
-    def load_data(self, file_path):
+    def load_data(self, file_path, columns=None, time_range=None):
         """
         Load data from a file.
 
@@ -27,6 +35,12 @@ class TimeDataIOHandler(ABC):
         ----------
         file_path : `str`
             A fully specified file path.
+        columns : `list[str]`, optional
+            The names of the measurements to load. Time is always loaded.
+            If not provided, all measurements are loaded.
+        time_range : `tuple`, optional
+            The (start, end) times of the records to load, inclusive.
+            If not provided, all records are loaded.
 
         Returns
         -------
@@ -49,6 +63,29 @@ class TimeDataIOHandler(ABC):
         """
         pass
 
+    @staticmethod
+    def _check_columns(ts, columns):
+        """
+        Function to ensure all requested measurements were found in the file.
+        """
+        if columns is not None:
+            missing = [name for name in columns if name not in ts.colnames]
+            if missing:
+                raise KeyError(f"Can't find data measurements {missing}")
+
+    @staticmethod
+    def _get_time_slice(time_data, time_range):
+        """
+        Function to get the slice of records within a time range. Times must be monotonic.
+        """
+        if time_range is None:
+            return slice(None)
+        start, end = Time(time_range[0]), Time(time_range[1])
+        in_range = np.flatnonzero((time_data >= start) & (time_data <= end))
+        if len(in_range) == 0:
+            return slice(0, 0)
+        return slice(in_range[0], in_range[-1] + 1)
+
 
 # ================================================================================================
 #                                   CDF HANDLER
@@ -68,7 +105,7 @@ class CDFHandler(TimeDataIOHandler):
         # CDF Schema
         self.schema = HERMESDataSchema()
 
-    def load_data(self, file_path):
+    def load_data(self, file_path, columns=None, time_range=None):
         """
         Load heliophysics data from a CDF file.
 
@@ -76,6 +113,12 @@ class CDFHandler(TimeDataIOHandler):
         ----------
         file_path : `str`
             The path to the CDF file.
+        columns : `list[str]`, optional
+            The names of the measurements to load. Time is always loaded.
+            If not provided, all measurements are loaded.
+        time_range : `tuple`, optional
+            The (start, end) times of the records to load, inclusive.
+            If not provided, all records are loaded.
 
         Returns
         -------
@@ -87,8 +130,11 @@ class CDFHandler(TimeDataIOHandler):
         if not Path(file_path).exists():
             raise FileNotFoundError(f"CDF Could not be loaded from path: {file_path}")
 
-        # Create a new TimeSeries
-        ts = TimeSeries()
+        time_data = None
+        time_attrs = {}
+        records = slice(None)
+        var_columns = {}
+        var_columns_attrs = {}
 
         # Open CDF file with context manager
         with CDF(file_path) as input_file:
@@ -101,33 +147,43 @@ class CDFHandler(TimeDataIOHandler):
                 else:
                     # gAttr is a single value
                     input_global_attrs[attr_name] = input_file.attrs[attr_name][0]
-            ts.meta.update(input_global_attrs)
 
             # First Variable we need to add is time/Epoch
             if "Epoch" in input_file:
-                time_data = Time(input_file["Epoch"][:].copy())
-                time_attrs = {}
+                # Reading a variable creates a new array so there is no need to copy it
+                time_data = Time(input_file["Epoch"][:])
+                # Only read the records within the time range
+                records = self._get_time_slice(time_data, time_range)
+                time_data = time_data[records]
                 for attr_name in input_file["Epoch"].attrs:
                     time_attrs[attr_name] = input_file["Epoch"].attrs[attr_name]
-                # Create the Time object
-                ts["time"] = time_data
-                # Create the Metadata
-                ts["time"].meta = OrderedDict()
-                ts["time"].meta.update(time_attrs)
 
-            # Add Variable Attributtes from the CDF file to TimeSeries
+            # Read Variables and their Attributes from the CDF file
             for var_name in input_file:
+                if columns is not None and var_name not in columns:
+                    # Skip reading variables that were not requested
+                    continue
                 if var_name != "Epoch":  # Since we added this separately
-                    var_data = input_file[var_name][:].copy()
                     var_attrs = {}
                     for attr_name in input_file[var_name].attrs:
                         var_attrs[attr_name] = input_file[var_name].attrs[attr_name]
                     # Create the Quantity object
-                    ts[var_name] = var_data
-                    ts[var_name].unit = var_attrs["UNITS"]
-                    # Create the Metadata
-                    ts[var_name].meta = OrderedDict()
-                    ts[var_name].meta.update(var_attrs)
+                    var_columns[var_name] = u.Quantity(
+                        input_file[var_name][records],
+                        unit=var_attrs["UNITS"],
+                        copy=False,
+                    )
+                    var_columns_attrs[var_name] = var_attrs
+
+        # Create the TimeSeries in one step rather than adding columns one at a time
+        ts = TimeSeries(time=time_data, data=var_columns, copy=False)
+        ts.meta.update(input_global_attrs)
+
+        # Create the Metadata
+        ts["time"].meta = time_attrs
+        for var_name, var_attrs in var_columns_attrs.items():
+            ts[var_name].meta = var_attrs
+        self._check_columns(ts, columns)
 
         # Return the given TimeSeries
         return ts
@@ -193,3 +249,358 @@ class CDFHandler(TimeDataIOHandler):
                     else:
                         # Add the Attribute to the CDF File
                         cdf_file[var_name].attrs[var_attr_name] = var_attr_val
+
+
+# ================================================================================================
+#                                   HDF5 HANDLER
+# ================================================================================================
+
+
+class HDF5Handler(TimeDataIOHandler):
+    """
+    A concrete implementation of TimeDataIOHandler for handling heliophysics data in HDF5 format.
+
+    Each measurement is stored as its own chunked and compressed dataset, with the measurement
+    metadata stored as attributes of the dataset and the global metadata stored as attributes
+    of the file. If `fs_page_size` is set, files are written with paged aggregation so that
+    reads can make use of the HDF5 page buffer.
+
+    This class requires the optional `h5py` package. If `use_blosc` is set, chunks are instead
+    compressed with Blosc in parallel and written directly to the file, bypassing the HDF5
+    filter pipeline. This requires the optional `blosc` and `hdf5plugin` packages, both to
+    write the file and to read it back.
+
+    Blosc has no per-call thread settings, so while a file is being saved with `use_blosc`
+    the process-wide Blosc settings are changed to use one thread per call and release the
+    GIL. They are restored once the file is written, but any other thread using Blosc at
+    the same time is also affected.
+    """
+
+    #: Maximum number of records in a single dataset chunk
+    chunk_length = 65536
+    #: Compression filter applied to each dataset when Blosc is not used
+    compression = "lzf"
+    #: Compress chunks with Blosc, which requires `blosc` and `hdf5plugin` to read the file
+    use_blosc = False
+    #: Blosc compressor used for direct chunk writes
+    blosc_cname = "zstd"
+    #: Blosc compression level used for direct chunk writes
+    blosc_clevel = 5
+    #: File space page size used to write files with paged aggregation. Files are padded to
+    #: whole pages, so paged aggregation is only used if this is set
+    fs_page_size = None
+    #: Minimum size of the blocks allocated for file metadata with paged aggregation
+    meta_block_size = 64 * 1024
+    #: Size of the page buffer used when reading files
+    page_buf_size = 16 * 1024 * 1024
+    #: Attribute recording the types of attributes that HDF5 cannot store natively
+    attr_types_name = "_HERMES_ATTR_TYPES"
+
+    def load_data(
+        self, file_path, columns=None, time_range=None, chunk_cache_size=None
+    ):
+        """
+        Load heliophysics data from a HDF5 file.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The path to the HDF5 file.
+        columns : `list[str]`, optional
+            The names of the measurements to load. Time is always loaded.
+            If not provided, all measurements are loaded.
+        time_range : `tuple`, optional
+            The (start, end) times of the records to load, inclusive.
+            If not provided, all records are loaded.
+        chunk_cache_size : `int`, optional
+            The size in bytes of the HDF5 chunk cache for each dataset.
+            Should be large enough to hold the chunks covering the records being read.
+            If not provided, the HDF5 default is used.
+
+        Returns
+        -------
+        data : `~astropy.time.TimeSeries`
+            An instance of `TimeSeries` containing the loaded data.
+        """
+        import h5py
+
+        try:
+            # Registers the Blosc filter so that datasets written with it can be read
+            import hdf5plugin  # noqa: F401
+        except ImportError:
+            pass
+
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"HDF5 Could not be loaded from path: {file_path}")
+
+        time_data = None
+        time_attrs = {}
+        records = slice(None)
+        var_columns = {}
+        var_columns_attrs = {}
+
+        try:
+            input_file = h5py.File(
+                file_path,
+                "r",
+                page_buf_size=self.page_buf_size,
+                rdcc_nbytes=chunk_cache_size,
+            )
+        except OSError:
+            # Page buffering is only available for files written with paged aggregation
+            input_file = h5py.File(file_path, "r", rdcc_nbytes=chunk_cache_size)
+
+        with input_file:
+            # Add Global Attributes from the HDF5 file
+            input_global_attrs = self._convert_attributes_from_hdf5(input_file.attrs)
+
+            # First Variable we need to add is time
+            if "time" in input_file:
+                self._check_filters("time", input_file["time"])
+                time_data = Time(input_file["time"][:].view("datetime64[ns]"))
+                # Only read the records within the time range
+                records = self._get_time_slice(time_data, time_range)
+                time_data = time_data[records]
+                time_attrs = self._convert_attributes_from_hdf5(
+                    input_file["time"].attrs
+                )
+
+            # Read Variables and their Attributes from the HDF5 file
+            for var_name, var_dataset in input_file.items():
+                if columns is not None and var_name not in columns:
+                    # Skip reading datasets that were not requested
+                    continue
+                if var_name != "time":  # Since we added this separately
+                    self._check_filters(var_name, var_dataset)
+                    var_attrs = self._convert_attributes_from_hdf5(var_dataset.attrs)
+                    # Create the Quantity object, keeping the stored data type
+                    # Reading a dataset creates a new array so there is no need to copy it
+                    var_columns[var_name] = u.Quantity(
+                        var_dataset[records],
+                        unit=var_attrs["UNITS"],
+                        dtype=var_dataset.dtype,
+                        copy=False,
+                    )
+                    var_columns_attrs[var_name] = var_attrs
+
+        # Create the TimeSeries in one step rather than adding columns one at a time
+        ts = TimeSeries(time=time_data, data=var_columns, copy=False)
+        ts.meta.update(input_global_attrs)
+
+        # Create the Metadata
+        ts["time"].meta = time_attrs
+        for var_name, var_attrs in var_columns_attrs.items():
+            ts[var_name].meta = var_attrs
+        self._check_columns(ts, columns)
+
+        # Return the given TimeSeries
+        return ts
+
+    def save_data(self, data, file_path):
+        """
+        Save heliophysics data to a HDF5 file.
+
+        Parameters
+        ----------
+        data : `hermes_core.timedata.TimeData`
+            An instance of `TimeData` containing the data to be saved.
+        file_path : `str`
+            The path to save the HDF5 file.
+
+        Returns
+        -------
+        path : `str`
+            A path to the saved file.
+
+        Notes
+        -----
+        With `use_blosc` set, the process-wide Blosc thread and GIL settings are changed
+        while the file is written, which also affects other threads using Blosc.
+        """
+        import h5py
+
+        executor = None
+        if self.use_blosc:
+            blosc, _ = self._import_blosc()
+            # Share one pool between all datasets and run Blosc single-threaded in each
+            # worker, releasing the GIL, so the chunks are compressed in parallel without
+            # oversubscribing the cores
+            blosc_nthreads = blosc.set_nthreads(1)
+            blosc_releasegil = blosc.set_releasegil(True)
+            executor = ThreadPoolExecutor()
+
+        # Initialize a new HDF5 File
+        h5_filename = f"{data.meta['Logical_file_id']}.h5"
+        output_h5_filepath = str(Path(file_path) / h5_filename)
+        file_space_kwargs = {}
+        if self.fs_page_size:
+            file_space_kwargs = {
+                "fs_strategy": "page",
+                "fs_page_size": self.fs_page_size,
+                "meta_block_size": self.meta_block_size,
+            }
+        try:
+            with h5py.File(
+                output_h5_filepath, "w-", track_order=True, **file_space_kwargs
+            ) as h5_file:
+                # Add Global Attriubtes to the HDF5 File
+                self._convert_attributes_to_hdf5(data.meta, h5_file.attrs)
+
+                # Add Variables and their Attributes
+                for var_name, var_data in data:
+                    if var_name == "time":
+                        # Store time as integer nanoseconds since the UNIX epoch (UTC)
+                        values = var_data.utc.datetime64.astype("datetime64[ns]")
+                        values = values.view("int64")
+                    else:
+                        values = var_data.value
+                    h5_dataset = self._create_dataset(
+                        h5_file, var_name, values, executor=executor
+                    )
+                    self._convert_attributes_to_hdf5(var_data.meta, h5_dataset.attrs)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+                blosc.set_nthreads(blosc_nthreads)
+                blosc.set_releasegil(blosc_releasegil)
+        return output_h5_filepath
+
+    def _create_dataset(self, h5_file, var_name, values, executor=None):
+        """
+        Function to write the values of a variable to a new chunked dataset.
+
+        If an executor is given the chunks are compressed with Blosc on it, otherwise they
+        are compressed by HDF5 with the `compression` filter.
+        """
+        chunk_length = max(1, min(len(values), self.chunk_length))
+        if executor is None:
+            # Let HDF5 compress the chunks with a built-in filter
+            return h5_file.create_dataset(
+                var_name,
+                data=values,
+                chunks=(chunk_length,),
+                compression=self.compression,
+            )
+
+        blosc, hdf5plugin = self._import_blosc()
+        values = np.ascontiguousarray(values)
+        h5_dataset = h5_file.create_dataset(
+            var_name,
+            shape=values.shape,
+            dtype=values.dtype,
+            chunks=(chunk_length,),
+            **hdf5plugin.Blosc(
+                cname=self.blosc_cname,
+                clevel=self.blosc_clevel,
+                shuffle=hdf5plugin.Blosc.BITSHUFFLE,
+            ),
+        )
+
+        def compress_chunk(offset):
+            end = offset + chunk_length
+            chunk = values[offset:end]
+            if len(chunk) < chunk_length:
+                # Edge chunks are stored at the full chunk size
+                chunk = np.concatenate(
+                    [chunk, np.zeros(chunk_length - len(chunk), dtype=values.dtype)]
+                )
+            return blosc.compress(
+                chunk,
+                typesize=values.dtype.itemsize,
+                clevel=self.blosc_clevel,
+                shuffle=blosc.BITSHUFFLE,
+                cname=self.blosc_cname,
+            )
+
+        # Compress the chunks in parallel and write them as-is, bypassing the filter pipeline
+        offsets = range(0, len(values), chunk_length)
+        for offset, chunk in zip(offsets, executor.map(compress_chunk, offsets)):
+            h5_dataset.id.write_direct_chunk((offset,), chunk, filter_mask=0)
+        return h5_dataset
+
+    @staticmethod
+    def _import_blosc():
+        """
+        Function to import the optional packages needed to write Blosc compressed chunks.
+        """
+        try:
+            import blosc
+            import hdf5plugin
+        except ImportError as e:
+            raise ImportError(
+                "Writing Blosc compressed HDF5 files requires the blosc and hdf5plugin packages."
+            ) from e
+        return blosc, hdf5plugin
+
+    @staticmethod
+    def _check_filters(var_name, dataset):
+        """
+        Function to verify that the compression filters of a dataset are available.
+        """
+        import h5py
+
+        dcpl = dataset.id.get_create_plist()
+        for i in range(dcpl.get_nfilters()):
+            filter_id, _, _, filter_name = dcpl.get_filter(i)
+            if not h5py.h5z.filter_avail(filter_id):
+                message = (
+                    f"Dataset '{var_name}' is compressed with the HDF5 filter "
+                    f"{filter_name.decode()} ({filter_id}) which is not available."
+                )
+                if filter_id == BLOSC_FILTER_ID:
+                    message += " Blosc compressed files require the hdf5plugin package."
+                raise ImportError(message)
+
+    @classmethod
+    def _convert_attributes_to_hdf5(cls, meta, attrs):
+        # Record the original type of values that are stored as strings
+        attr_types = {}
+        for attr_name, attr_value in meta.items():
+            # We cannot add None Values to HDF5 Attributes
+            if attr_value is None:
+                attr_value = ""
+                attr_types[attr_name] = "none"
+            elif isinstance(attr_value, datetime.datetime):
+                attr_value = attr_value.isoformat()
+                attr_types[attr_name] = "datetime"
+            elif isinstance(attr_value, tuple) or (
+                isinstance(attr_value, list)
+                and not all(isinstance(value, str) for value in attr_value)
+            ):
+                # Sequences are stored as arrays of a single type, so keep their literal
+                # representation to restore the type of each element
+                attr_value = repr(attr_value)
+                attr_types[attr_name] = "literal"
+            try:
+                attrs[attr_name] = attr_value
+            except TypeError:
+                # Fall back to the string representation of unsupported types
+                attrs[attr_name] = str(attr_value)
+        if attr_types:
+            attrs[cls.attr_types_name] = json.dumps(attr_types)
+
+    @classmethod
+    def _convert_attributes_from_hdf5(cls, attrs):
+        meta = {}
+        attr_types = {}
+        for attr_name, attr_value in attrs.items():
+            if attr_name == cls.attr_types_name:
+                attr_types = json.loads(attr_value)
+                continue
+            if isinstance(attr_value, np.ndarray) and attr_value.dtype.kind in "OSU":
+                # Lists of strings are stored as arrays
+                attr_value = [
+                    value.decode() if isinstance(value, bytes) else str(value)
+                    for value in attr_value
+                ]
+            meta[attr_name] = attr_value
+
+        # Restore values that were stored as strings
+        for attr_name, attr_type in attr_types.items():
+            if attr_type == "none":
+                meta[attr_name] = None
+            elif attr_type == "datetime":
+                meta[attr_name] = datetime.datetime.fromisoformat(meta[attr_name])
+            elif attr_type == "literal":
+                meta[attr_name] = ast.literal_eval(meta[attr_name])
+        return meta
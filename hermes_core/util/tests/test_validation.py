@@ -53,6 +53,14 @@ def test_non_existant_file():
     assert "Could not open CDF File at path:" in result[0]
 
 
+def test_uppercase_extension():
+    """Function to ensure file extensions are matched case-insensitively"""
+    invlid_path = str(Path(hermes_core.__file__).parent / "data" / "test.CDF")
+    result = validate(invlid_path)
+    assert len(result) == 1
+    assert "Could not open CDF File at path:" in result[0]
+
+
 def test_missing_global_attrs():
     """Function to ensure missing global attributes are reported in validation"""
 
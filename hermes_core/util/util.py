@@ -16,6 +16,18 @@ VALID_DATA_LEVELS = ["l0", "l1", "ql", "l2", "l3", "l4"]
 FILENAME_EXTENSION = ".cdf"
 
 
+def _get_file_extension(filepath):
+    """
+    Returns the lower-case file extension of a file path, including the leading dot,
+    or an empty string if the file has no extension.
+    """
+    _, dot, file_ext = str(filepath).rpartition(".")
+    # A dot in a directory name or at the end of the file name is not a file extension
+    if not dot or not file_ext or "/" in file_ext or os.sep in file_ext:
+        return ""
+    return "." + file_ext.lower()
+
+
 def create_science_filename(
     instrument, time, level, version, mode="", descriptor="", test=False
 ):
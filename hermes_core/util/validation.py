@@ -1,8 +1,8 @@
-from pathlib import Path
 from abc import ABC, abstractmethod
 from spacepy.pycdf import CDF, CDFError
 from spacepy.pycdf.istp import FileChecks, VariableChecks
 from hermes_core.util.schema import HERMESDataSchema
+from hermes_core.util.util import _get_file_extension
 
 __all__ = ["validate", "CDFValidator"]
 
@@ -22,13 +22,13 @@ def validate(filepath):
         A list of validation errors returned. A valid file will result in an emppty list being returned.
     """
     # Determine the file type
-    file_extension = Path(filepath).suffix
+    file_extension = _get_file_extension(filepath)
 
     # Create the appropriate validator object based on file type
-    if file_extension == ".cdf":
-        validator = CDFValidator()
-    else:
+    validator_cls = _VALIDATORS.get(file_extension)
+    if validator_cls is None:
         raise ValueError(f"Unsupported file type: {file_extension}")
+    validator = validator_cls()
 
     # Call the validate method of the validator object
     return validator.validate(filepath)
@@ -305,3 +305,7 @@ class CDFValidator(TimeDataValidator):
                 )
 
         return variable_checks_errors
+
+
+# Mapping of (lower-case) file extension to the validator used for that file type
+_VALIDATORS = {".cdf": CDFValidator}